@@ -34,21 +34,23 @@ def main():
         "How do I calculate reorder points?"
     ]
     
-    for question in questions:
-        print(f"\n{'='*60}")
-        result = system.query(question)
-        print()
+    # All answers are generated in a single batched model call
+    results = system.query_batch(questions)
+    print()
     
     # Step 3: Generate a forecast
     print("\n3️⃣ Generating demand forecast...")
-    forecast = system.forecast_demand("SKU0", days=30)
-    
-    print(f"\n📊 Forecast Summary:")
-    print(f"  SKU: {forecast['sku_id']}")
-    print(f"  Average: {forecast['metrics']['forecast_avg']:.1f} units/day")
-    print(f"  Trend: {forecast['metrics']['trend']}")
-    print(f"  Growth: {forecast['metrics']['growth_rate']:+.1f}%")
-    print(f"  Recommendation: {forecast['recommendations']['action']}")
+    try:
+        forecast = system.forecast_demand("SKU0", days=30)
+    except KeyError as e:
+        print(f"  Skipping forecast: {e}")
+    else:
+        print(f"\n📊 Forecast Summary:")
+        print(f"  SKU: {forecast.sku_id}")
+        print(f"  Average: {forecast.metrics['forecast_avg']:.1f} units/day")
+        print(f"  Trend: {forecast.metrics['trend']}")
+        print(f"  Growth: {forecast.metrics['growth_rate']:+.1f}%")
+        print(f"  Recommendation: {forecast.recommendations['action']}")
     
     # Step 4: Analyze risks
     print("\n4️⃣ Analyzing risks...")
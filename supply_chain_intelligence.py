@@ -25,20 +25,50 @@ GitHub: https://github.com/fyncode16/supply-chain-intelligence
 
 import pandas as pd
 import numpy as np
+import openpyxl
 from datetime import datetime, timedelta
+import functools
+import hashlib
 import json
+from dataclasses import dataclass
+import os
 import re
-from collections import Counter
+import string
+from collections import Counter, OrderedDict
 import warnings
 
 # Optional: AI integration (works without it too)
 try:
-    from transformers import pipeline
+    import torch
+    from transformers import pipeline, AutoModelForSeq2SeqLM, AutoTokenizer
     AI_AVAILABLE = True
 except ImportError:
     AI_AVAILABLE = False
     print(" AI features disabled. Install with: pip install transformers torch")
 
+# Optional: sparse TF-IDF search (falls back to pure Python without it)
+try:
+    import sklearn
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+    from sklearn.pipeline import make_pipeline
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+# Optional: on-disk cache of the search index
+try:
+    import joblib
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
+# Optional: fast parquet copy of the Excel data
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 warnings.filterwarnings('ignore')
 
 
@@ -53,13 +83,24 @@ class Config:
     DATA_FILE = "data/supply_chain_data.xlsx"
     POLICIES_FILE = "data/supply_chain_policies.txt"
     OUTPUT_DIR = "outputs/"
+    # Search index, parquet copy of DATA_FILE and ONNX export, relative to the
+    # working directory. None disables all three (the workbook is re-read)
+    CACHE_DIR = ".cache/"
     
     # AI Model settings
     AI_MODEL = "google/flan-t5-base"  # Free, 250M parameters
     AI_MAX_LENGTH = 256
+    AI_BATCH_SIZE = 8  # Max prompts per forward pass in query_batch (bounds GPU memory)
+    # "half" (BF16/FP16), "int8" (bitsandbytes) or "full" (FP32).
+    # Reduced precision is only used on CUDA; CPUs always run FP32.
+    AI_PRECISION = "half"
+    # "torch", "compile" (torch.compile; first answers are slow while it compiles)
+    # or "onnx" (ONNX Runtime via optimum; FP32, exported once into CACHE_DIR)
+    AI_BACKEND = "torch"
     
     # Search settings
     SEARCH_TOP_K = 3
+    QUERY_CACHE_SIZE = 512  # Answers memoized per normalized question
     
     # Forecasting settings
     FORECAST_DAYS = 30
@@ -70,57 +111,128 @@ class Config:
 # 1. DOCUMENT SEARCH ENGINE (RAG)
 # ============================================================================
 
+# Search tokens: ASCII words of 3+ characters, lowercased by a translate table
+_TOKEN_RE = re.compile(r'[a-z0-9]{3,}')
+_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+@functools.lru_cache(maxsize=None)
+def _numba_scorer():
+    """
+    JIT-compiled scorer for the fallback search index, or None without numba
+    (imported on first use, so only the fallback path pays for numba)
+    """
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+    
+    @njit(cache=True, parallel=True)
+    def score_documents(indptr, indices, tfidf, query_counts):
+        """Sum TF-IDF x query term count per document over CSR arrays"""
+        n_docs = len(indptr) - 1
+        scores = np.zeros(n_docs)
+        for doc in prange(n_docs):
+            total = 0.0
+            for j in range(indptr[doc], indptr[doc + 1]):
+                total += tfidf[j] * query_counts[indices[j]]
+            scores[doc] = total
+        return scores
+    
+    return score_documents
+
+
 class DocumentSearchEngine:
     """
     Simple but effective document search using TF-IDF
-    No external dependencies required
+    Uses a sparse scikit-learn index when available, plain numpy arrays otherwise
     """
     
+    # Bump when the index layout changes so stale on-disk caches are ignored
+    CACHE_VERSION = 4
+    
+    # Only this much of each document is kept after indexing
+    SUMMARY_CHARS = 500
+    
     def __init__(self, documents):
         """
         Initialize search engine with documents
         
         Args:
-            documents (list): List of text documents to index
+            documents (iterable): Text documents to index (a generator is fine,
+                it is consumed once)
         """
-        self.documents = documents
-        self.vocab = set()
-        self.doc_freq = Counter()
-        self.doc_terms = []
+        self.documents = []
+        self.pipe = None
         
         print("Indexing documents...")
-        self._build_index()
-        print(f"✓ Indexed {len(documents)} documents with {len(self.vocab)} unique terms")
+        if SKLEARN_AVAILABLE:
+            self._build_sparse_index(self._keep_summaries(documents))
+            n_terms = int((self.matrix.getnnz(axis=0) > 0).sum())
+        else:
+            self._build_index(self._keep_summaries(documents))
+            n_terms = len(self.term2id)
+        print(f"✓ Indexed {len(self.documents)} documents with {n_terms} unique terms")
+    
+    def _keep_summaries(self, documents):
+        """Pass documents through to the indexer, keeping only a short summary of each"""
+        for doc in documents:
+            self.documents.append(doc[:self.SUMMARY_CHARS])
+            yield doc
     
     def _tokenize(self, text):
-        """Extract meaningful words from text"""
-        text = text.lower()
-        words = re.findall(r'\b\w+\b', text)
-        return [w for w in words if len(w) > 2]  # Filter short words
-    
-    def _build_index(self):
-        """Build TF-IDF index"""
-        for doc in self.documents:
+        """Extract meaningful words (3+ characters) from text"""
+        return _TOKEN_RE.findall(text.translate(_LOWER))
+    
+    def _build_index(self, documents):
+        """Build TF-IDF index as flat CSR arrays (struct of arrays)"""
+        self.term2id = {}
+        indptr = [0]
+        indices = []
+        tf = []
+        
+        for doc in documents:
             terms = self._tokenize(doc)
-            self.doc_terms.append(terms)
+            counts = Counter(
+                self.term2id.setdefault(term, len(self.term2id)) for term in terms
+            )
             
-            # Track unique terms and document frequency
-            unique_terms = set(terms)
-            self.vocab.update(unique_terms)
-            for term in unique_terms:
-                self.doc_freq[term] += 1
+            # Term frequency, normalized by document length
+            indices.extend(counts.keys())
+            tf.extend(count / max(len(terms), 1) for count in counts.values())
+            indptr.append(len(indices))
         
-        self.vocab = sorted(list(self.vocab))
-    
-    def _tfidf_score(self, term, doc_idx):
-        """Calculate TF-IDF score for a term in a document"""
-        # Term frequency
-        tf = self.doc_terms[doc_idx].count(term) / max(len(self.doc_terms[doc_idx]), 1)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.doc_ids = np.repeat(np.arange(len(self.documents)), np.diff(self.indptr))
         
-        # Inverse document frequency
-        idf = np.log(len(self.documents) / (self.doc_freq.get(term, 0) + 1))
-        
-        return tf * idf
+        # Inverse document frequency, computed once and folded into the weights
+        doc_freq = np.bincount(self.indices, minlength=len(self.term2id))
+        self.idf = np.log(len(self.documents) / (doc_freq + 1))
+        self.tfidf = np.asarray(tf, dtype=np.float64) * self.idf[self.indices]
+    
+    def _build_sparse_index(self, documents):
+        """Build L2-normalized TF-IDF matrix (documents x hashed terms, CSR)"""
+        # Hashing keeps no vocabulary in memory; raw counts go to TfidfTransformer
+        self.pipe = make_pipeline(
+            HashingVectorizer(
+                n_features=2**18,
+                alternate_sign=False,
+                norm=None,
+                token_pattern=_TOKEN_RE.pattern,
+                lowercase=True
+            ),
+            TfidfTransformer(norm='l2')
+        )
+        self.matrix = self.pipe.fit_transform(documents)
+    
+    def _top_k_indices(self, scores, top_k):
+        """Indices of the top k scores, best first (O(N) selection)"""
+        k = min(top_k, len(scores))
+        if k <= 0:
+            return np.array([], dtype=int)
+        idx = np.argpartition(scores, -k)[-k:]
+        return idx[np.argsort(-scores[idx])]
     
     def search(self, query, top_k=3):
         """
@@ -133,20 +245,29 @@ class DocumentSearchEngine:
         Returns:
             list: Top matching documents with scores
         """
-        query_terms = self._tokenize(query)
-        
-        # Calculate relevance scores
-        scores = []
-        for doc_idx in range(len(self.documents)):
-            score = sum(
-                self._tfidf_score(term, doc_idx) 
-                for term in query_terms 
-                if term in self.vocab
+        if self.pipe is not None:
+            # Cosine similarity as a single sparse matrix-vector product
+            query_vec = self.pipe.transform([query])
+            scores = (self.matrix @ query_vec.T).toarray().ravel()
+        else:
+            # Count query terms, then sum TF-IDF over every (doc, term) entry
+            query_ids = np.asarray(
+                [self.term2id[t] for t in self._tokenize(query) if t in self.term2id],
+                dtype=np.int64
             )
-            scores.append(score)
+            query_counts = np.bincount(query_ids, minlength=len(self.term2id))
+            score_documents = _numba_scorer()
+            if score_documents is not None:
+                scores = score_documents(self.indptr, self.indices, self.tfidf, query_counts)
+            else:
+                scores = np.bincount(
+                    self.doc_ids,
+                    weights=self.tfidf * query_counts[self.indices],
+                    minlength=len(self.documents)
+                )
         
         # Get top k documents
-        top_indices = np.argsort(scores)[-top_k:][::-1]
+        top_indices = self._top_k_indices(scores, top_k)
         
         results = []
         for rank, idx in enumerate(top_indices):
@@ -170,6 +291,9 @@ class AIAnswerGenerator:
     100% free, runs locally, no API key needed
     """
     
+    # Start of the answer text returned when generation fails
+    ERROR_PREFIX = "Error generating AI answer"
+    
     def __init__(self):
         """Initialize AI model (downloads ~900MB first time)"""
         if not AI_AVAILABLE:
@@ -182,17 +306,101 @@ class AIAnswerGenerator:
         print("First run may take 1-2 minutes to download model...")
         
         try:
+            tokenizer = AutoTokenizer.from_pretrained(Config.AI_MODEL)
+            
+            if Config.AI_BACKEND == "onnx":
+                if Config.AI_PRECISION != "full":
+                    print(f"  AI_PRECISION='{Config.AI_PRECISION}' is ignored by the "
+                          f"onnx backend (runs in FP32)")
+                model_kwargs = {}
+                model = self._load_onnx_model()
+            else:
+                model_kwargs = self._model_kwargs()
+                model = AutoModelForSeq2SeqLM.from_pretrained(Config.AI_MODEL, **model_kwargs)
+                model.generation_config.use_cache = True  # Decoder KV cache
+                if Config.AI_BACKEND == "compile":
+                    # Compiles on the first calls (warm-up takes a while); dynamic
+                    # shapes avoid a recompile for every new decoder length
+                    print("  torch.compile enabled: the first answers will be slow")
+                    model.forward = torch.compile(model.forward, dynamic=True)
+            
+            # ONNX sessions and quantized models are already placed on their device
+            device_kwargs = {}
+            if Config.AI_BACKEND != "onnx" and 'device_map' not in model_kwargs:
+                device_kwargs['device'] = 0 if torch.cuda.is_available() else -1
+            
             self.llm = pipeline(
                 "text2text-generation",
-                model=Config.AI_MODEL,
-                max_length=Config.AI_MAX_LENGTH
+                model=model,
+                tokenizer=tokenizer,
+                max_length=Config.AI_MAX_LENGTH,
+                **device_kwargs
             )
-            print("✓ AI model loaded successfully!")
+            print(f"✓ AI model loaded successfully! ({Config.AI_BACKEND}, "
+                  f"{getattr(model, 'dtype', 'float32')})")
             
         except Exception as e:
             print(f"Error loading AI model: {e}")
             raise
     
+    def _load_onnx_model(self):
+        """Load the ONNX Runtime model, exporting it once into the cache directory"""
+        import onnxruntime as ort
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        
+        use_gpu = torch.cuda.is_available()
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if not use_gpu:
+            session_options.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
+        
+        load_kwargs = {
+            'provider': "CUDAExecutionProvider" if use_gpu else "CPUExecutionProvider",
+            'session_options': session_options,
+            'use_cache': True,
+            'use_io_binding': use_gpu
+        }
+        
+        # Without a cache directory the model is exported on every start
+        export_dir = None
+        if Config.CACHE_DIR:
+            export_dir = os.path.join(
+                Config.CACHE_DIR, "onnx", Config.AI_MODEL.replace("/", "--")
+            )
+            if os.path.isdir(export_dir):
+                return ORTModelForSeq2SeqLM.from_pretrained(export_dir, **load_kwargs)
+        
+        print("  Exporting model to ONNX (one-time, may take a few minutes)...")
+        model = ORTModelForSeq2SeqLM.from_pretrained(
+            Config.AI_MODEL, export=True, **load_kwargs
+        )
+        if export_dir:
+            model.save_pretrained(export_dir)
+        return model
+    
+    def _model_kwargs(self):
+        """Precision and placement options for from_pretrained"""
+        use_gpu = torch.cuda.is_available()
+        
+        # BF16/FP16 matmuls are usually slower than FP32 on CPUs without native support
+        if not use_gpu:
+            return {}
+        
+        # INT8 weight-only quantization needs bitsandbytes
+        if Config.AI_PRECISION == "int8":
+            from transformers import BitsAndBytesConfig
+            return {
+                'quantization_config': BitsAndBytesConfig(load_in_8bit=True),
+                'device_map': 'auto'
+            }
+        
+        if Config.AI_PRECISION == "half":
+            if torch.cuda.is_bf16_supported():
+                return {'torch_dtype': torch.bfloat16}
+            return {'torch_dtype': torch.float16}
+        
+        return {}
+    
     def generate_answer(self, query, context_documents):
         """
         Generate natural language answer using AI
@@ -204,35 +412,114 @@ class AIAnswerGenerator:
         Returns:
             str: AI-generated answer
         """
+        prompt = self._build_prompt(query, context_documents)
+        
+        try:
+            # Generate answer
+            result = self.llm(prompt, max_length=Config.AI_MAX_LENGTH, do_sample=False)
+            answer = result[0]['generated_text']
+            return answer
+            
+        except Exception as e:
+            return f"{self.ERROR_PREFIX}: {str(e)}"
+    
+    def generate_answers(self, queries, context_lists):
+        """
+        Generate answers for several questions with batched model calls
+        (up to Config.AI_BATCH_SIZE prompts per forward pass)
+        
+        Args:
+            queries (list): User questions
+            context_lists (list): Search results for each question
+            
+        Returns:
+            list: AI-generated answers, in the same order as queries
+        """
+        prompts = [
+            self._build_prompt(query, context_documents)
+            for query, context_documents in zip(queries, context_lists)
+        ]
+        if not prompts:
+            return []
+        
+        try:
+            results = self.llm(
+                prompts,
+                batch_size=min(len(prompts), Config.AI_BATCH_SIZE),
+                max_length=Config.AI_MAX_LENGTH,
+                do_sample=False
+            )
+            return [result['generated_text'] for result in results]
+            
+        except Exception as e:
+            return [f"{self.ERROR_PREFIX}: {str(e)}"] * len(prompts)
+    
+    def _build_prompt(self, query, context_documents):
+        """Build the model prompt from the question and top documents"""
         # Build context from top documents
         context = "\n\n".join([
             doc['document'][:500] 
             for doc in context_documents[:2]
         ])
         
-        # Create prompt
-        prompt = f"""Based on these supply chain policies:
+        return f"""Based on these supply chain policies:
 
 {context}
 
 Question: {query}
 
 Provide a clear, actionable answer in 2-3 sentences:"""
-        
-        try:
-            # Generate answer
-            result = self.llm(prompt, max_length=Config.AI_MAX_LENGTH, do_sample=False)
-            answer = result[0]['generated_text']
-            return answer
-            
-        except Exception as e:
-            return f"Error generating AI answer: {str(e)}"
 
 
 # ============================================================================
 # 3. DEMAND FORECASTING ENGINE
 # ============================================================================
 
+@dataclass(eq=False)
+class ForecastResult:
+    """
+    Demand forecast stored as arrays (one entry per forecast day)
+    
+    Compares by identity; use np.array_equal on the arrays to compare values.
+    """
+    
+    sku_id: str
+    forecast_date: str
+    dates: np.ndarray   # datetime64[D]
+    pred: np.ndarray    # float32 predicted demand (rounded to 2 decimals)
+    lb: np.ndarray      # float32 lower bound (95% interval)
+    ub: np.ndarray      # float32 upper bound (95% interval)
+    metrics: dict
+    recommendations: dict
+    
+    def to_records(self):
+        """Daily predictions as a list of dicts (date, demand and bounds)"""
+        return [
+            {
+                'date': date,
+                'predicted_demand': value,
+                'lower_bound': lower,
+                'upper_bound': upper
+            }
+            for date, value, lower, upper in zip(
+                np.datetime_as_string(self.dates, unit='D').tolist(),
+                np.round(self.pred.astype(np.float64), 2).tolist(),
+                np.round(self.lb.astype(np.float64), 2).tolist(),
+                np.round(self.ub.astype(np.float64), 2).tolist()
+            )
+        ]
+    
+    def to_dict(self):
+        """Full forecast as a JSON-friendly dict"""
+        return {
+            'sku_id': self.sku_id,
+            'forecast_date': self.forecast_date,
+            'predictions': self.to_records(),
+            'metrics': self.metrics,
+            'recommendations': self.recommendations
+        }
+
+
 class DemandForecaster:
     """
     Multi-method demand forecasting with AI-powered insights
@@ -248,7 +535,7 @@ class DemandForecaster:
             periods (int): Number of days to forecast
             
         Returns:
-            dict: Complete forecast with insights and recommendations
+            ForecastResult: Complete forecast with insights and recommendations
         """
         demand_values = historical_data['y'].values
         dates = historical_data['ds'].values
@@ -268,23 +555,20 @@ class DemandForecaster:
         else:
             trend = "stable"
         
-        # Generate forecasts
-        predictions = []
-        last_date = pd.to_datetime(dates[-1])
+        # Generate forecasts: recent average + trend (no negative demand)
+        i = np.arange(periods)
+        forecast_values = np.maximum(0, avg_demand + trend_coef * (len(demand_values) + i))
+        lower_bounds = np.maximum(0, forecast_values - 1.96 * std_demand)
+        upper_bounds = forecast_values + 1.96 * std_demand
         
-        for i in range(periods):
-            # Simple forecast: recent average + trend
-            forecast_value = avg_demand + (trend_coef * (len(demand_values) + i))
-            forecast_value = max(0, forecast_value)  # No negative demand
-            
-            future_date = last_date + timedelta(days=i+1)
-            
-            predictions.append({
-                'date': future_date.strftime('%Y-%m-%d'),
-                'predicted_demand': round(forecast_value, 2),
-                'lower_bound': round(max(0, forecast_value - 1.96 * std_demand), 2),
-                'upper_bound': round(forecast_value + 1.96 * std_demand, 2)
-            })
+        # Round to cents as the previous list-of-dicts output did, before
+        # the float32 cast, so to_records() and forecast_avg are unchanged
+        forecast_values = np.round(forecast_values, 2)
+        lower_bounds = np.round(lower_bounds, 2)
+        upper_bounds = np.round(upper_bounds, 2)
+        
+        last_day = pd.to_datetime(dates[-1]).to_datetime64().astype('datetime64[D]')
+        future_dates = last_day + np.arange(1, periods + 1)
         
         # Calculate growth rate
         if len(demand_values) > 1:
@@ -302,27 +586,30 @@ class DemandForecaster:
             action = "MAINTAIN"
         
         # Calculate recommendations
-        forecast_avg = np.mean([p['predicted_demand'] for p in predictions])
+        forecast_avg = forecast_values.mean() if periods else 0.0
         target_stock = forecast_avg * 14  # 2 weeks coverage
         reorder_point = forecast_avg * 7   # 1 week coverage
         
-        return {
-            'sku_id': sku_id,
-            'forecast_date': datetime.now().strftime('%Y-%m-%d'),
-            'predictions': predictions,
-            'metrics': {
+        return ForecastResult(
+            sku_id=sku_id,
+            forecast_date=datetime.now().strftime('%Y-%m-%d'),
+            dates=future_dates,
+            pred=forecast_values.astype(np.float32),
+            lb=lower_bounds.astype(np.float32),
+            ub=upper_bounds.astype(np.float32),
+            metrics={
                 'historical_avg': round(avg_demand, 2),
                 'forecast_avg': round(forecast_avg, 2),
                 'growth_rate': round(growth_rate, 2),
                 'trend': trend
             },
-            'recommendations': {
+            recommendations={
                 'action': action,
                 'target_stock': round(target_stock, 2),
                 'reorder_point': round(reorder_point, 2),
                 'rationale': f"Based on {trend} trend with {growth_rate:+.1f}% growth"
             }
-        }
+        )
 
 
 # ============================================================================
@@ -385,6 +672,54 @@ class RiskAnalyzer:
             'risk_factors': risk_factors,
             'action': action
         }
+    
+    def analyze_frame(self, df):
+        """
+        Analyze risk for all products at once (vectorized)
+        
+        Args:
+            df (DataFrame): Product rows
+            
+        Returns:
+            DataFrame: One risk assessment per product, same fields as analyze_product
+        """
+        # Same rules as analyze_product, evaluated column-wise
+        low_stock = self._column(df, 'Stock levels', 100) < 10
+        long_lead = self._column(df, 'Lead time', 0) > 20
+        high_defect = self._column(df, 'Defect rates', 0) > 5
+        slow_shipping = self._column(df, 'Shipping times', 0) > 10
+        
+        risk_score = low_stock * 3 + long_lead * 2 + high_defect * 3 + slow_shipping * 1
+        
+        # Determine risk level
+        conditions = [risk_score >= 6, risk_score >= 3]
+        risk_level = np.select(conditions, ["HIGH", "MEDIUM"], "LOW")
+        action = np.select(
+            conditions,
+            ["URGENT ACTION REQUIRED", "Review and Monitor"],
+            "Continue Normal Operations"
+        )
+        
+        labels = ["Low Stock", "Long Lead Time", "High Defect Rate", "Slow Shipping"]
+        flags = zip(low_stock, long_lead, high_defect, slow_shipping)
+        risk_factors = [
+            [label for label, hit in zip(labels, row) if hit]
+            for row in flags
+        ]
+        
+        return pd.DataFrame({
+            'sku': self._column(df, 'SKU', 'Unknown'),
+            'risk_level': risk_level,
+            'risk_score': risk_score,
+            'risk_factors': risk_factors,
+            'action': action
+        })
+    
+    def _column(self, df, name, default):
+        """Column values as an array, or a constant array if the column is missing"""
+        if name in df.columns:
+            return df[name].to_numpy()
+        return np.full(len(df), default)
 
 
 # ============================================================================
@@ -397,6 +732,12 @@ class SupplyChainIntelligence:
     Integrates search, AI, forecasting, and risk analysis
     """
     
+    # Columns kept in memory for forecasting and risk analysis
+    DATA_COLUMNS = [
+        'SKU', 'Stock levels', 'Lead time', 'Defect rates',
+        'Shipping times', 'Number of products sold'
+    ]
+    
     def __init__(self, data_file, use_ai=True):
         """
         Initialize the system
@@ -409,17 +750,35 @@ class SupplyChainIntelligence:
         print("SUPPLY CHAIN INTELLIGENCE SYSTEM")
         print("="*80)
         
-        # Load data
-        print("\n Loading data...")
-        self.df = pd.read_excel(data_file)
-        print(f"✓ Loaded {len(self.df)} products")
-        
-        # Create documents
-        print("\n Creating knowledge base...")
-        self.documents = self._create_documents()
+        # Per-instance LRU answer cache (cleared whenever self.df is replaced)
+        self._query_cache = OrderedDict()
         
-        # Initialize search engine
-        self.search_engine = DocumentSearchEngine(self.documents)
+        # Reuse the search index from disk if the data file is unchanged
+        index_cache = self._index_cache_path(data_file)
+        cached = self._load_index_cache(index_cache)
+        if cached:
+            # Load data
+            print("\n Loading data...")
+            self.df = self._load_data(data_file)
+            print(f"✓ Loaded {len(self.df)} products")
+            
+            self.documents = cached['documents']
+            self.search_engine = cached['search_engine']
+            print(f"\n✓ Loaded search index for {len(self.documents)} documents from cache")
+        else:
+            # One pass over the workbook: documents stream into the search
+            # engine while the DATA_COLUMNS values are collected for self.df
+            print("\n Loading data and creating knowledge base...")
+            data_columns = {}
+            self.search_engine = DocumentSearchEngine(
+                self._create_documents(data_file, data_columns)
+            )
+            self.documents = self.search_engine.documents
+            self.df = pd.DataFrame(data_columns)
+            print(f"✓ Loaded {len(self.df)} products")
+            
+            self._save_parquet(data_file, self.df)
+            self._save_index_cache(index_cache)
         
         # Initialize AI (if requested and available)
         self.ai = None
@@ -439,10 +798,112 @@ class SupplyChainIntelligence:
         
         print("\n System ready!")
     
-    def _create_documents(self):
-        """Create searchable documents from data and policies"""
-        documents = []
+    def _load_data(self, data_file):
+        """Load product data, preferring a cached parquet copy of the Excel file"""
+        parquet_file = self._cache_file(data_file, "data", "parquet") if PYARROW_AVAILABLE else None
+        
+        if parquet_file and os.path.exists(parquet_file):
+            try:
+                df = pd.read_parquet(parquet_file, engine='pyarrow')
+                return df[[col for col in df.columns if self._is_data_column(col)]]
+            except Exception as e:
+                print(f"  Ignoring unreadable parquet cache: {e}")
+        
+        df = pd.read_excel(data_file, usecols=self._is_data_column)
+        self._save_parquet(data_file, df)
+        return df
+    
+    def _save_parquet(self, data_file, df):
+        """Write the parquet copy of the product data for the next startup"""
+        parquet_file = self._cache_file(data_file, "data", "parquet") if PYARROW_AVAILABLE else None
+        if parquet_file is None:
+            return
+        
+        try:
+            os.makedirs(os.path.dirname(parquet_file), exist_ok=True)
+            df.to_parquet(parquet_file, engine='pyarrow', index=False)
+            self._remove_stale_cache_files(parquet_file)
+        except Exception as e:
+            print(f"  Could not write parquet cache: {e}")
+    
+    def _is_data_column(self, column):
+        """Whether a sheet column is kept in self.df (missing ones are allowed)"""
+        return column in self.DATA_COLUMNS
+    
+    def _cache_file(self, data_file, kind, extension, extra=""):
+        """
+        Cache file for data derived from data_file, or None if caching is disabled
+        
+        Named <kind>_<path digest>_<state digest>, where the state digest covers the
+        file's mtime and size (plus extra), so any change to the workbook, including
+        replacing it with an older copy, selects a different file.
+        """
+        if not Config.CACHE_DIR:
+            return None
         
+        stat = os.stat(data_file)
+        path_digest = hashlib.md5(os.path.abspath(data_file).encode()).hexdigest()[:12]
+        state = f"{stat.st_mtime}:{stat.st_size}:{extra}"
+        state_digest = hashlib.md5(state.encode()).hexdigest()[:12]
+        return os.path.join(Config.CACHE_DIR, f"{kind}_{path_digest}_{state_digest}.{extension}")
+    
+    def _remove_stale_cache_files(self, path):
+        """Delete cache files of the same kind and data file as path, except path itself"""
+        directory, name = os.path.split(path)
+        prefix = name.rsplit('_', 1)[0] + '_'
+        for other in os.listdir(directory):
+            if other.startswith(prefix) and other != name:
+                try:
+                    os.remove(os.path.join(directory, other))
+                except OSError:
+                    pass
+    
+    def _index_cache_path(self, data_file):
+        """Cache file for the search index (same data file key as the parquet copy)"""
+        if not JOBLIB_AVAILABLE:
+            return None
+        
+        # Pickled sklearn objects are only reused by the version that wrote them
+        sklearn_version = sklearn.__version__ if SKLEARN_AVAILABLE else "none"
+        extra = f"{DocumentSearchEngine.CACHE_VERSION}:{sklearn_version}"
+        return self._cache_file(data_file, "index", "joblib", extra)
+    
+    def _load_index_cache(self, path):
+        """Load cached documents and search engine, or None if unavailable"""
+        if path is None or not os.path.exists(path):
+            return None
+        
+        try:
+            return joblib.load(path)
+        except Exception as e:
+            print(f"  Ignoring unreadable index cache: {e}")
+            return None
+    
+    def _save_index_cache(self, path):
+        """Persist documents and search engine for the next startup"""
+        if path is None:
+            return
+        
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            joblib.dump(
+                {'documents': self.documents, 'search_engine': self.search_engine},
+                path,
+                compress=3
+            )
+            self._remove_stale_cache_files(path)
+        except Exception as e:
+            print(f"  Could not write index cache: {e}")
+    
+    def _create_documents(self, data_file, data_columns=None):
+        """
+        Yield searchable documents from policies and the Excel rows
+        
+        Args:
+            data_file (str): Path to the Excel file
+            data_columns (dict, optional): Filled with {column: values} for the
+                DATA_COLUMNS in the sheet while rows are streamed
+        """
         # Add policy documents
         policy_docs = [
             """
@@ -494,21 +955,44 @@ Required Actions by Risk Level:
 - LOW: Monitor during regular reviews
             """
         ]
-        documents.extend(policy_docs)
+        yield from policy_docs
         
-        # Add product documents
-        for _, row in self.df.iterrows():
-            doc = f"""
+        # Add product documents, streamed straight from the workbook
+        # (first sheet, the one read_excel loads into self.df)
+        workbook = openpyxl.load_workbook(data_file, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = next(rows)
+            
+            kept = [
+                (i, name) for i, name in enumerate(header)
+                if self._is_data_column(name)
+            ]
+            if data_columns is not None:
+                data_columns.update((name, []) for _, name in kept)
+            
+            for values in rows:
+                if all(value is None for value in values):
+                    continue  # Skip blank rows
+                
+                # Empty cells become NaN, as in a DataFrame row
+                row = {
+                    name: np.nan if value is None else value
+                    for name, value in zip(header, values)
+                }
+                if data_columns is not None:
+                    for i, name in kept:
+                        data_columns[name].append(row[name])
+                doc = f"""
 Product {row['SKU']}: {row['Product type']} at ${row['Price']:.2f}
 Stock: {row['Stock levels']} units | Sales: {row['Number of products sold']} units
 Supplier: {row['Supplier name']} ({row['Location']})
 Lead Time: {row['Lead time']} days | Defect Rate: {row['Defect rates']:.2f}%
 Shipping: {row['Transportation modes']} via {row['Routes']}
-            """.strip()
-            documents.append(doc)
-        
-        print(f"✓ Created {len(documents)} documents")
-        return documents
+                """.strip()
+                yield doc
+        finally:
+            workbook.close()
     
     def query(self, question):
         """
@@ -523,6 +1007,21 @@ Shipping: {row['Transportation modes']} via {row['Routes']}
         print(f"\n Question: {question}")
         print("-"*80)
         
+        # Repeated questions are answered from the cache
+        key = self._query_key(question)
+        entry = self._query_cache_get(key)
+        if entry is None:
+            entry = self._answer(question)
+            self._query_cache_put(key, entry)
+        result = self._query_result(question, entry)
+        
+        print(f"\n💬 Answer ({result['source']}):")
+        print(result['answer'])
+        
+        return result
+    
+    def _answer(self, question):
+        """Search and answer a single question (uncached)"""
         # Search for relevant documents
         search_results = self.search_engine.search(question, top_k=Config.SEARCH_TOP_K)
         
@@ -536,63 +1035,238 @@ Shipping: {row['Transportation modes']} via {row['Routes']}
             answer = search_results[0]['document'][:500]
             source = "retrieval"
         
-        print(f"\n💬 Answer ({source}):")
-        print(answer)
-        
         return {
-            'question': question,
             'answer': answer,
             'source': source,
             'context_documents': search_results
         }
     
-    def forecast_demand(self, sku_id, days=30):
+    def _query_key(self, question):
+        """Cache key for a question (the question itself is what gets answered)"""
+        return question.strip().lower()
+    
+    def _query_cache_get(self, key):
+        """Cached answer entry for a key, or None (marks it as recently used)"""
+        entry = self._query_cache.get(key)
+        if entry is not None:
+            self._query_cache.move_to_end(key)
+        return entry
+    
+    def _query_cache_put(self, key, entry):
+        """Memoize an answer entry, evicting the least recently used beyond the limit"""
+        # Generation failures may be transient, so they are never cached
+        if entry['source'] == "ai" and entry['answer'].startswith(AIAnswerGenerator.ERROR_PREFIX):
+            return
+        
+        self._query_cache[key] = entry
+        self._query_cache.move_to_end(key)
+        while len(self._query_cache) > Config.QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+    
+    def _query_result(self, question, entry):
+        """Result dict for the caller, with its own copy of the context documents"""
+        return {
+            'question': question,
+            'answer': entry['answer'],
+            'source': entry['source'],
+            'context_documents': [dict(doc) for doc in entry['context_documents']]
+        }
+    
+    def clear_query_cache(self):
+        """Drop all memoized query answers"""
+        self._query_cache.clear()
+    
+    @property
+    def df(self):
+        """
+        Product data
+        
+        Assigning a new frame rebuilds df_by_sku and clears the query cache.
+        In-place edits (self.df.loc[...] = ...) are not seen by the forecasts
+        until the frame is reassigned.
+        """
+        return self._df
+    
+    @df.setter
+    def df(self, value):
+        self._df = value
+        # One row per SKU for hash lookups (first row wins on duplicates)
+        self.df_by_sku = value.drop_duplicates('SKU').set_index('SKU', drop=False)
+        self.clear_query_cache()
+    
+    def query_batch(self, questions):
+        """
+        Answer several questions, generating all uncached AI answers in one batch
+        
+        Args:
+            questions (list): User questions
+            
+        Returns:
+            list: One result dict per question (same fields as query)
+        """
+        keys = [self._query_key(question) for question in questions]
+        entries = {key: self._query_cache_get(key) for key in keys}
+        
+        # Each uncached question is answered once, even if repeated in the batch
+        pending = {}
+        for question, key in zip(questions, keys):
+            if entries[key] is None and key not in pending:
+                pending[key] = question
+        
+        if pending:
+            pending_questions = list(pending.values())
+            
+            # Search for relevant documents
+            search_results = [
+                self.search_engine.search(question, top_k=Config.SEARCH_TOP_K)
+                for question in pending_questions
+            ]
+            
+            # Generate answers
+            if self.ai:
+                answers = self.ai.generate_answers(pending_questions, search_results)
+                source = "ai"
+            else:
+                answers = [results[0]['document'][:500] for results in search_results]
+                source = "retrieval"
+            
+            for key, answer, results in zip(pending, answers, search_results):
+                entries[key] = {
+                    'answer': answer,
+                    'source': source,
+                    'context_documents': results
+                }
+                self._query_cache_put(key, entries[key])
+        
+        batch = []
+        for question, key in zip(questions, keys):
+            result = self._query_result(question, entries[key])
+            
+            print(f"\n Question: {question}")
+            print("-"*80)
+            print(f"\n💬 Answer ({result['source']}):")
+            print(result['answer'])
+            
+            batch.append(result)
+        
+        return batch
+    
+    def forecast_demand(self, sku_id, days=30, rng=None):
         """
         Generate demand forecast for a SKU
         
         Args:
             sku_id (str): SKU identifier
             days (int): Forecast horizon
+            rng (int or Generator, optional): Seed or generator for the synthetic
+                history (default: global np.random state, so np.random.seed applies)
             
         Returns:
-            dict: Forecast results
+            ForecastResult: Forecast results
+            
+        Raises:
+            KeyError: If the SKU is not in the data
         """
         print(f"\n Generating forecast for {sku_id}...")
         
         # Get product data
-        product = self.df[self.df['SKU'] == sku_id]
-        if product.empty:
-            return {'error': f'SKU {sku_id} not found'}
-        
-        product = product.iloc[0]
-        
-        # Generate synthetic historical data
-        base_demand = product['Number of products sold'] / 30
-        hist_data = self._generate_historical_data(base_demand, days=90)
+        try:
+            product = self.df_by_sku.loc[sku_id]
+        except KeyError:
+            raise KeyError(f"SKU {sku_id} not found") from None
         
         # Generate forecast
-        forecast = self.forecaster.forecast(hist_data, sku_id, periods=days)
+        forecast = self._forecast_one(
+            self.forecaster, sku_id, product['Number of products sold'], days, rng
+        )
         
         print(f" Forecast complete")
-        print(f"  Average: {forecast['metrics']['forecast_avg']:.1f} units/day")
-        print(f"  Trend: {forecast['metrics']['trend']}")
-        print(f"  Action: {forecast['recommendations']['action']}")
+        print(f"  Average: {forecast.metrics['forecast_avg']:.1f} units/day")
+        print(f"  Trend: {forecast.metrics['trend']}")
+        print(f"  Action: {forecast.recommendations['action']}")
         
         return forecast
     
-    def _generate_historical_data(self, base_demand, days=90):
-        """Generate synthetic historical demand data"""
-        dates = [datetime.now() - timedelta(days=days-i) for i in range(days)]
-        demand = []
+    def forecast_demand_batch(self, sku_ids, days=30, rng=None, n_jobs=1):
+        """
+        Generate demand forecasts for several SKUs at once
+        
+        Args:
+            sku_ids (list): SKU identifiers
+            days (int): Forecast horizon
+            rng (int or Generator, optional): Seed or generator for the synthetic history
+            n_jobs (int): Worker processes for the per-SKU fits. The default 1 runs
+                in-process, which is fastest for typical sheets (each fit takes
+                about a millisecond); only use more for very large SKU lists
+            
+        Returns:
+            dict: ForecastResult keyed by SKU (None for SKUs not in the data)
+        """
+        print(f"\n Generating forecasts for {len(sku_ids)} SKUs...")
+        
+        # Indexed lookups instead of a boolean mask per SKU
+        units_sold = self.df_by_sku['Number of products sold']
+        found = [sku for sku in dict.fromkeys(sku_ids) if sku in units_sold.index]
         
-        for i in range(days):
-            trend = base_demand * (1 + i/days * 0.2)
-            noise = np.random.normal(0, base_demand * 0.1)
-            daily = max(0, trend + noise)
-            demand.append(daily)
+        # Synthetic history for every SKU in one (n_skus, 90) draw
+        base_demand = units_sold[found].to_numpy(dtype=float) / 30
+        dates, demand = self._synthetic_demand(base_demand, days=90, rng=rng)
+        histories = [pd.DataFrame({'ds': dates, 'y': row}) for row in demand]
+        
+        if n_jobs != 1 and JOBLIB_AVAILABLE:
+            forecasts = joblib.Parallel(n_jobs=n_jobs, backend='loky')(
+                joblib.delayed(self.forecaster.forecast)(hist_data, sku, periods=days)
+                for sku, hist_data in zip(found, histories)
+            )
+        else:
+            forecasts = [
+                self.forecaster.forecast(hist_data, sku, periods=days)
+                for sku, hist_data in zip(found, histories)
+            ]
         
+        results = {sku: None for sku in sku_ids}
+        results.update(zip(found, forecasts))
+        
+        print(f" {len(forecasts)} forecasts complete")
+        return results
+    
+    @staticmethod
+    def _forecast_one(forecaster, sku_id, units_sold, days, rng=None):
+        """Forecast one SKU from its monthly sales"""
+        # Generate synthetic historical data
+        base_demand = units_sold / 30
+        hist_data = SupplyChainIntelligence._generate_historical_data(
+            base_demand, days=90, rng=rng
+        )
+        
+        return forecaster.forecast(hist_data, sku_id, periods=days)
+    
+    @staticmethod
+    def _generate_historical_data(base_demand, days=90, rng=None):
+        """Generate synthetic historical demand data (rng: seed or Generator)"""
+        dates, demand = SupplyChainIntelligence._synthetic_demand(base_demand, days, rng)
         return pd.DataFrame({'ds': dates, 'y': demand})
     
+    @staticmethod
+    def _synthetic_demand(base_demand, days=90, rng=None):
+        """
+        Synthetic daily demand for one base demand (shape (days,)) or an array
+        of them (shape (n, days)), plus the shared dates
+        """
+        # One day per row, ending yesterday
+        dates = pd.date_range(end=datetime.now() - timedelta(days=1), periods=days)
+        
+        # Without an rng, draw from the global state so np.random.seed still applies
+        rng = np.random if rng is None else np.random.default_rng(rng)
+        
+        base = np.asarray(base_demand, dtype=float)[..., np.newaxis]
+        i = np.arange(days)
+        trend = base * (1 + i/days * 0.2)
+        noise = rng.normal(0, base * 0.1, size=trend.shape)
+        demand = np.maximum(0, trend + noise)
+        
+        return dates, demand
+    
     def analyze_risks(self, top_n=10):
         """
         Analyze risks across all products
@@ -605,12 +1279,7 @@ Shipping: {row['Transportation modes']} via {row['Routes']}
         """
         print(f"\n Analyzing risks for top {top_n} products...")
         
-        risks = []
-        for _, product in self.df.head(top_n).iterrows():
-            risk = self.risk_analyzer.analyze_product(product)
-            risks.append(risk)
-        
-        risk_df = pd.DataFrame(risks)
+        risk_df = self.risk_analyzer.analyze_frame(self.df.head(top_n))
         
         print(f"\n Risk Summary:")
         print(f"  HIGH: {len(risk_df[risk_df['risk_level'] == 'HIGH'])}")